@@ -1,6 +1,6 @@
 
 from typing import List
-import os, sys, argparse
+import shutil, sys, argparse
 
 
 
@@ -8,33 +8,43 @@ class LoggerOut:
     def __init__(self, filename):
         self.terminal = sys.stdout
         self.filename = filename
+        self.file = open(filename, "a", buffering=8192)
 
     def write(self, message):
         self.terminal.write(message)
-        with open(self.filename, "a") as file:
-            print(message, file=file, flush=True, end='')
+        self.file.write(message)
 
     def flush(self):
-        pass
+        self.terminal.flush()
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
 
 
 class LoggerIn:
     def __init__(self, filename):
         self.terminal = sys.stdin
         self.filename = filename
+        # line buffered: input() flushes stdout before reading, so writing
+        # each entry through keeps the log in the same order as the session
+        self.file = open(filename, "a", buffering=1)
 
     def readline(self):
         entry = self.terminal.readline()
-        with open(self.filename, "a") as file:
-            print(entry.rstrip(), file=file, flush=True)
+        self.file.write(entry.rstrip('\r\n') + '\n')
         return entry
 
+    def close(self):
+        self.file.close()
+
 
 class Card:
     '''
     Individual cards are created with a term and definition, and mistakes
     initialized at 0
     '''
+    __slots__ = ('term', 'definition', 'mistakes')
 
     def __init__(self, term: str, definition: str, mistakes=0) -> None:
         self.term = term
@@ -57,39 +67,71 @@ class Card:
 class Deck:
     '''
     A Deck is a collection (list) of cards. Creating a new deck creates an empty list.
+    Cards are also indexed by term and by definition for constant-time lookups.
     '''
     def __init__(self):
         self.cards = []
+        self._by_term = {}
+        self._by_def = {}
+        self._idx = {}
 
     def has_term(self, term: str):
         '''
         Returns True if the deck contains a card with the given term
         '''
-        for card in self.cards:
-            return term == card.term
+        return term in self._by_term
 
     def has_def(self, definition: str):
         '''
         Returns True if the deck contains a card with the given definition
         '''
-        for card in self.cards:
-            return definition == card.definition
+        return definition in self._by_def
 
 
     def add_card(self, card: Card):
         '''
         Adds a card to the deck
         '''
-        self.cards.append(card)
-        #print(f'The pair ("{card}") has been added.\n')
+        old = self._by_term.get(card.term)
+        if old is not None:
+            # keep the indexes consistent when an import overwrites a term
+            self._unindex_def(old)
+            self.cards[self._idx[card.term]] = card
+        else:
+            self._idx[card.term] = len(self.cards)
+            self.cards.append(card)
+        self._by_term[card.term] = card
+        self._index_def(card)
+
+    def _index_def(self, card: Card) -> None:
+        # imports may bring in several terms sharing a definition, so each
+        # definition maps to every card that uses it
+        self._by_def.setdefault(card.definition, []).append(card)
+
+    def _unindex_def(self, card: Card) -> None:
+        owners = self._by_def.get(card.definition)
+        if owners is None:
+            return
+        for i, owner in enumerate(owners):
+            if owner is card:
+                del owners[i]
+                break
+        if not owners:
+            del self._by_def[card.definition]
 
     def remove_card(self, term: str):
         '''
         Removes a card from the deck
         '''
-        for card in self.cards:
-            if card.term == term:
-                self.cards.remove(card)
+        card = self._by_term.pop(term, None)
+        if card is not None:
+            self._unindex_def(card)
+            # swap the last card into the freed slot so removal is O(1)
+            i = self._idx.pop(term)
+            last = self.cards.pop()
+            if i != len(self.cards):
+                self.cards[i] = last
+                self._idx[last.term] = i
         print('The card has been removed')
 
 
@@ -112,26 +154,23 @@ class Deck:
         Given a definition of a card, return the term associated
         with that definition
         '''
-        for card in self.cards:
-            if card.definition == definition:
-                return card.term
-
-    def most_mistakes(self) -> int:
-        mistakes = [x.mistakes for x in self.cards]
-        #print(len(mistakes))
-        return max(mistakes)
-
+        return self._by_def[definition][0].term
 
     def hardest_card(self) -> List[Card]:
-        hardest_cards = [x for x in self.cards if x.mistakes == self.most_mistakes()]
-        hardest_cards = list(filter(lambda x: x.mistakes != 0, hardest_cards))
-        #for card in hardest_cards:
-        #    print(card, type(card))
+        most, hardest_cards = 0, []
+        for card in self.cards:
+            if card.mistakes > most:
+                most, hardest_cards = card.mistakes, [card]
+            elif card.mistakes == most and most > 0:
+                hardest_cards.append(card)
         return hardest_cards
 
 
     def clear(self)-> None:
-        self.cards = []
+        self.cards.clear()
+        self._by_term.clear()
+        self._by_def.clear()
+        self._idx.clear()
 
 
 
@@ -152,19 +191,21 @@ class NoSuchCardError(Exception):
 
 # FUNCTIONS ***************************************
 
+_CHOICES_TUPLE = ('add', 'remove', 'import', 'export', 'ask', 'exit', 'log', 'hardest card', 'reset stats')
+_CHOICES = frozenset(_CHOICES_TUPLE)
+_MENU_MSG = "Input the action ("+', '.join(_CHOICES_TUPLE)+'): '
+
 
 def menu() -> str:
     '''
     The user is given a list of choices to drive the program. Only valid choices (exactly
     as they appear in the list) are allowed. Returns the 'command' from the user.
     '''
-    choices = ('add', 'remove', 'import', 'export', 'ask', 'exit', 'log', 'hardest card', 'reset stats')
-    message = "Input the action ("+', '.join(choices)+'): '
-    print(message)
+    print(_MENU_MSG)
     while True:
         try:
             command = input()
-            if command not in choices:
+            if command not in _CHOICES:
                 raise InvalidChoiceError
             else:
                 return command
@@ -249,11 +290,11 @@ def import_file(deck: Deck, file_name=None) -> None:
             print('File name: ')
             file_name = input()
         row = 0
+        add_card, make_card = deck.add_card, Card
         with open(file_name, 'r') as f_in:
-            for line in f_in.readlines():
-                card = line.split(":")
-                deck.add_card(Card(card[0], card[1], int(card[2].strip())))
-                row += 1
+            for row, line in enumerate(f_in, 1):
+                term, definition, mistakes = line.rstrip('\n').split(':', 2)
+                add_card(make_card(term, definition, int(mistakes)))
             print(f'{row} cards have been loaded.\n')
 
     except FileNotFoundError:
@@ -270,8 +311,7 @@ def export_file(deck: Deck, file_name=None) -> None:
             print('File name: ')
             file_name = input()
         with open(file_name, 'w+') as f_out:
-            for card in deck.cards:
-                f_out.write(f'{card.term}:{card.definition}:{card.mistakes}\n')
+            f_out.write(''.join(f'{card.term}:{card.definition}:{card.mistakes}\n' for card in deck.cards))
         print(f'{deck.size()} cards have been saved.\n')
         deck.clear()
     except FileNotFoundError:
@@ -298,23 +338,27 @@ def card_practice(deck: Deck, times: int) -> None:
     Given a deck and number of times to 'ask', this function
     cycles through cards in the deck for the user to practice on.
     '''
+    if not deck.cards:
+        print('Deck is empty.')
+        return
+    write = sys.stdout.write
     count = 0
     while count < times:
         for card in deck.cards:
             if count == times:
                 break
-            print(f'Print the definition of "{card.term}": ')
+            write(f'Print the definition of "{card.term}": \n')
             answer = input()
             if answer == card.definition:
-                print('Correct!')
+                write('Correct!\n')
 
-            elif answer in deck.definitions():
+            elif deck.has_def(answer):
                 term = deck.get_term(answer)
-                print(f'Wrong. The right answer is "{card.definition}", but your definition is correct for "{term}".')
+                write(f'Wrong. The right answer is "{card.definition}", but your definition is correct for "{term}".\n')
                 card.add_mistake()
 
             else:
-                print(f'Wrong. The right answer is "{card.definition}". ')
+                write(f'Wrong. The right answer is "{card.definition}". \n')
                 card.add_mistake()
 
             count += 1
@@ -327,13 +371,17 @@ def log() -> None:
     '''
     print('File name:')
     file_name = input()
-    os.rename('/Users/warrencrutcher/PycharmProjects/pythoncore/Flashcards/Flashcards/task/default.txt', f'/Users/warrencrutcher/PycharmProjects/pythoncore/Flashcards/Flashcards/task/{file_name}' )
-    print('The log has been saved.')
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        shutil.copyfile(sys.stdout.filename, file_name)
+        print('The log has been saved.')
+    except OSError:
+        print('Failed.')
 
 
 def hardest_card(deck: Deck) -> None:
     cards = deck.hardest_card()
-    print(len(cards))
     if not cards:
         print('There are no cards with errors.')
     elif len(cards) == 1:
@@ -350,8 +398,21 @@ def reset(deck: Deck) -> None:
     print('Card statistics have been reset.')
 
 
+HANDLERS = {
+    'add': add,
+    'remove': remove,
+    'import': import_file,
+    'export': export_file,
+    'ask': ask,
+    'log': lambda deck: log(),
+    'hardest card': hardest_card,
+    'reset stats': reset,
+}
+
 
 def main() -> None:
+    # start each session with an empty log so log() saves only this run
+    open('default.txt', 'w').close()
     sys.stdin = LoggerIn('default.txt')
     sys.stdout = LoggerOut('default.txt')
     deck = Deck()
@@ -373,22 +434,7 @@ def main() -> None:
                 export_file(deck, args.export_to)
 
             break
-        if command == 'add':
-            add(deck)
-        if command == 'remove':
-            remove(deck)
-        if command == 'import':
-            import_file(deck)
-        if command == 'export':
-            export_file(deck)
-        if command == 'ask':
-            ask(deck)
-        if command == 'log':
-            log()
-        if command == 'hardest card':
-            hardest_card(deck)
-        if command == 'reset stats':
-            reset(deck)
+        HANDLERS[command](deck)
 
 if __name__ == '__main__':
     main()
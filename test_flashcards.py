@@ -0,0 +1,61 @@
+from flashcards import Card, Deck
+
+
+def assert_indexes_consistent(deck: Deck) -> None:
+    assert deck._by_term == {card.term: card for card in deck.cards}
+    assert deck._idx == {card.term: i for i, card in enumerate(deck.cards)}
+    by_def = {}
+    for card in deck.cards:
+        by_def.setdefault(card.definition, []).append(card)
+    assert {d: set(map(id, cards)) for d, cards in deck._by_def.items()} == \
+        {d: set(map(id, cards)) for d, cards in by_def.items()}
+
+
+def test_add_and_remove_keep_indexes_consistent():
+    deck = Deck()
+    for i in range(5):
+        deck.add_card(Card(f't{i}', f'd{i}'))
+    deck.remove_card('t1')
+    deck.remove_card('t4')
+    assert_indexes_consistent(deck)
+    assert not deck.has_term('t1')
+    assert not deck.has_def('d4')
+    assert deck.get_term('d3') == 't3'
+
+
+def test_removing_one_of_two_cards_sharing_a_definition():
+    deck = Deck()
+    deck.add_card(Card('a', 'x'))
+    deck.add_card(Card('b', 'x', 2))
+    deck.remove_card('b')
+    assert_indexes_consistent(deck)
+    assert deck.has_def('x')
+    assert deck.get_term('x') == 'a'
+    deck.remove_card('a')
+    assert_indexes_consistent(deck)
+    assert not deck.has_def('x')
+
+
+def test_overwriting_a_term_keeps_other_cards_definitions():
+    deck = Deck()
+    deck.add_card(Card('a', 'x'))
+    deck.add_card(Card('b', 'x'))
+    deck.add_card(Card('a', 'y', 1))
+    assert_indexes_consistent(deck)
+    assert deck.size() == 2
+    assert deck.get_term('x') == 'b'
+    assert deck.get_term('y') == 'a'
+    deck.add_card(Card('b', 'y'))
+    assert_indexes_consistent(deck)
+    assert not deck.has_def('x')
+    deck.remove_card('a')
+    assert_indexes_consistent(deck)
+    assert deck.get_term('y') == 'b'
+
+
+def test_clear_empties_indexes():
+    deck = Deck()
+    deck.add_card(Card('a', 'x'))
+    deck.clear()
+    assert deck.size() == 0
+    assert_indexes_consistent(deck)